@@ -0,0 +1,32 @@
+import os
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+os.environ.setdefault("LOG_LEVEL", "DEBUG")
+
+
+@pytest.fixture(scope="session")
+def _mock_sf_session():
+    """One MagicMock Salesforce client shared across the whole run.
+
+    Async entrypoints are AsyncMocks so tool code can await them; tests set
+    return_value per case and the per-test fixture resets state between them.
+    """
+    mock = MagicMock()
+    mock.soql = AsyncMock()
+    mock.create = AsyncMock()
+    mock.update = AsyncMock()
+    mock.composite_update = AsyncMock()
+    return mock
+
+
+@pytest.fixture
+def mock_sf(_mock_sf_session):
+    _mock_sf_session.reset_mock(return_value=True, side_effect=True)
+    # Plain bool so ensure_connected's truthiness check skips connect();
+    # rebind soql so a test that swapped in a stub doesn't leak it onward
+    _mock_sf_session.connected = True
+    _mock_sf_session.soql = AsyncMock()
+    return _mock_sf_session
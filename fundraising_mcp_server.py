@@ -10,14 +10,20 @@ This is an MVP intended for demos while following production-grade patterns.
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
+import csv
+import functools
+import io
+import itertools
 import json
 import logging
 import os
 import re
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple
 
 from cachetools import TTLCache
 from dateutil.relativedelta import relativedelta
@@ -45,12 +51,41 @@ except Exception:  # pragma: no cover - allow tests without mcp installed
 
 try:
     from simple_salesforce import Salesforce, SalesforceMalformedRequest
+    from simple_salesforce.exceptions import SalesforceExpiredSession
 except Exception:  # pragma: no cover
     Salesforce = object  # type: ignore
     class SalesforceMalformedRequest(Exception):
         pass
+    class SalesforceExpiredSession(Exception):
+        pass
+
+import httpx
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any, indent: bool = False) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0, default=str).decode()
+
+    def _json_dumps_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=str)
+except Exception:  # pragma: no cover - orjson is optional
+    _json_loads = json.loads
 
-import requests
+    def _json_dumps(obj: Any, indent: bool = False) -> str:
+        return json.dumps(obj, default=str, indent=2 if indent else None)
+
+    def _json_dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, default=str).encode()
+
+# Shared async HTTP client: keep-alive means requests after the first reuse
+# pooled TLS connections instead of paying TCP+TLS setup per call.
+_HTTP = httpx.AsyncClient(
+    timeout=30,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=75),
+)
 
 # ------------------------------------------------------------
 # Logging & Env
@@ -64,6 +99,18 @@ logger = logging.getLogger("fundraising_mcp")
 
 DEFAULT_LIMIT = 25
 CACHE_TTL_SECONDS = 60
+# asyncio's default executor caps at min(32, cpu+4) threads, which serializes
+# bursts of thread-dispatched SF calls; these are I/O bound so a higher cap is cheap.
+THREAD_POOL_SIZE = int(os.getenv("FUNDRAISING_THREAD_POOL", "64"))
+SF_API_VERSION = "v59.0"
+# Reads expected to exceed this many rows go through Bulk API 2.0 instead of REST
+BULK_QUERY_THRESHOLD = 2000
+# Last-written field sets kept per (sObject, Id) to skip no-op bulk updates
+LAST_WRITTEN_MAX = 512
+# Salesforce does not report the token TTL; assume a conservative default and
+# refresh a few minutes before it lapses.
+TOKEN_TTL_MINUTES = 110
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
 
 # ------------------------------------------------------------
 # Utilities: formatting, parsing
@@ -79,6 +126,10 @@ def fmt_date(dt: Optional[datetime]) -> str:
     return dt.strftime("%Y-%m-%d") if dt else ""
 
 
+# Nearly all titles are literal constants ("Donor Results", "AI Insights",
+# "Salesforce Error", ...), so the divider is computed once per title; the
+# LRU bound keeps dynamic titles like "Donor Profile: <name>" from pinning memory.
+@functools.lru_cache(maxsize=64)
 def header(title: str) -> str:
     return f"{title}\n" + "-" * max(6, len(title))
 
@@ -89,51 +140,72 @@ class Timeframe:
     end: datetime
 
 
-AMOUNT_PATTERN = re.compile(r"\$?\s*(\d{1,3}(?:[,\s]\d{3})*(?:\.\d{1,2})?|\d+(?:\.\d{1,2})?|\d+\s*[kKmMbB])")
-MONTHS_PATTERN = re.compile(r"(last|past)\s*(\d+)\s*(month|months)", re.I)
-YEARS_PATTERN = re.compile(r"(last|past)\s*(\d+)\s*(year|years)", re.I)
-SIX_MONTHS_PATTERN = re.compile(r"(last|past)\s*6\s*months", re.I)
-ONE_YEAR_PATTERN = re.compile(r"(last|past)\s*1\s*year", re.I)
+# re.ASCII keeps \d/\s on the engine's byte fast-path; none of the inputs are
+# expected to carry non-ASCII digits. The amount pattern tolerates commas
+# inside the digit group (no pre-replace needed) and captures the k/m/b
+# multiplier as its own group. Requiring at least one ",ddd" group in the
+# first alternative keeps plain runs like "5000" on the \d+ branch instead of
+# truncating to the first three digits.
+AMOUNT_PATTERN = re.compile(r"\$?\s*(\d{1,3}(?:,\d{3})+(?:\.\d{1,2})?|\d+(?:\.\d{1,2})?)\s*([kKmMbB])?", re.ASCII)
+# One pass decides every "last/past N months/years" form; a missing count
+# defaults to 1 so "last year" still parses.
+TIMEFRAME_PATTERN = re.compile(r"(?:last|past)\s*(?P<n>\d+)?\s*(?P<unit>months?|years?)", re.I | re.ASCII)
+
+# Router/lookup patterns, compiled once so the NL hot path never hits re's
+# internal pattern cache (which is bounded and lock-protected).
+_HOW_MANY_RE = re.compile(r"how\s+many\s+(donation|gift)s?.*this\s+month")
+_TOP_N_RE = re.compile(r"top\s+(\d+)\s+donor")
+_LAST_N_MONTHS_RE = re.compile(r"last\s*(\d+)\s*months?")
+_CONTACT_ID_RE = re.compile(r"^(003|005)[A-Za-z0-9]{12,18}$")
+_LIMIT_CLAUSE_RE = re.compile(r"\blimit\s+\d+\b", re.I | re.ASCII)
+
+
+_AMOUNT_FACTORS = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+_DIGIT_RE = re.compile(r"\d", re.ASCII)
 
 
 def parse_amount(text: str) -> Optional[float]:
-    match = AMOUNT_PATTERN.search(text.replace(",", ""))
+    # Cheap pre-check: digit-free criteria (common for "major donors" prompts)
+    # skip the full amount pattern entirely.
+    if not _DIGIT_RE.search(text):
+        return None
+    match = AMOUNT_PATTERN.search(text)
     if not match:
         return None
-    raw = match.group(1).strip().lower()
-    factor = 1
-    if raw.endswith("k"):
-        factor = 1_000
-        raw = raw[:-1]
-    elif raw.endswith("m"):
-        factor = 1_000_000
-        raw = raw[:-1]
-    elif raw.endswith("b"):
-        factor = 1_000_000_000
-        raw = raw[:-1]
+    raw = match.group(1)
+    if "," in raw:
+        raw = raw.replace(",", "")
+    suffix = match.group(2)
+    factor = _AMOUNT_FACTORS[suffix.lower()] if suffix else 1
     try:
         return float(raw) * factor
     except Exception:
         return None
 
 
-def parse_timeframe(text: str) -> Optional[Timeframe]:
-    now = datetime.now(timezone.utc)
-    # Specific helpers
-    m = MONTHS_PATTERN.search(text)
-    if m:
-        months = int(m.group(2))
-        return Timeframe(start=now - relativedelta(months=months), end=now)
-    m = YEARS_PATTERN.search(text)
-    if m:
-        years = int(m.group(2))
-        return Timeframe(start=now - relativedelta(years=years), end=now)
-    if SIX_MONTHS_PATTERN.search(text):
-        return Timeframe(start=now - relativedelta(months=6), end=now)
-    if ONE_YEAR_PATTERN.search(text):
-        return Timeframe(start=now - relativedelta(years=1), end=now)
-    # Defaults
-    return None
+def parse_timeframe(text: str, now: Optional[datetime] = None) -> Optional[Timeframe]:
+    m = TIMEFRAME_PATTERN.search(text)
+    if not m:
+        return None
+    if now is None:
+        now = datetime.now(timezone.utc)
+    n = int(m.group("n") or 1)
+    if m.group("unit").lower().startswith("y"):
+        return Timeframe(start=now - relativedelta(years=n), end=now)
+    return Timeframe(start=now - relativedelta(months=n), end=now)
+
+
+def parse_timeframe_months(text: str, default: int) -> int:
+    """Like parse_timeframe but returns just a month count.
+
+    Avoids the Timeframe/relativedelta construction (and the clock read)
+    when the caller only needs whole months for a LAST_N_DAYS clause.
+    """
+    m = TIMEFRAME_PATTERN.search(text)
+    if not m:
+        return default
+    n = int(m.group("n") or 1)
+    return max(1, n * 12 if m.group("unit").lower().startswith("y") else n)
 
 
 # ------------------------------------------------------------
@@ -149,6 +221,15 @@ class SalesforceClient:
     All network calls are delegated to a thread via asyncio.to_thread for async compatibility.
     """
 
+    # One long-lived instance, but slots also catch typo'd attribute writes
+    # and drop the per-instance __dict__
+    __slots__ = (
+        "client_id", "client_secret", "refresh_token", "instance_url", "domain",
+        "username", "password", "security_token",
+        "_sf", "_access_token", "_instance", "_token_expiry",
+        "_connect_lock", "_sobjects", "_rest_headers",
+    )
+
     def __init__(self) -> None:
         self.client_id = os.getenv("SF_CLIENT_ID")
         self.client_secret = os.getenv("SF_CLIENT_SECRET")
@@ -162,12 +243,39 @@ class SalesforceClient:
 
         self._sf: Optional[Salesforce] = None
         self._access_token: Optional[str] = None
+        self._instance: Optional[str] = None
+        self._token_expiry: Optional[datetime] = None
+        self._connect_lock = asyncio.Lock()
+        # Lazily-built SObject proxies, invalidated whenever _sf is replaced
+        self._sobjects: Dict[str, Any] = {}
+        # Prebuilt auth headers for the direct REST path; None means the
+        # session came from the username/password flow and calls go through
+        # simple_salesforce on a thread instead.
+        self._rest_headers: Optional[Dict[str, str]] = None
+
+    def _sobject(self, name: str) -> Any:
+        proxy = self._sobjects.get(name)
+        if proxy is None:
+            assert self._sf is not None
+            proxy = self._sobjects[name] = getattr(self._sf, name)
+        return proxy
+
+    @property
+    def connected(self) -> bool:
+        """True while the cached session is expected to remain valid."""
+        if self._sf is None:
+            return False
+        if self._token_expiry is None:
+            # username/password sessions have no known expiry; trust the
+            # retry-on-expired wrapper to recover if SF invalidates them.
+            return True
+        return datetime.now(timezone.utc) < self._token_expiry - TOKEN_REFRESH_MARGIN
 
     def _token_endpoint(self) -> str:
         base = "https://login.salesforce.com" if self.domain == "login" else "https://test.salesforce.com"
         return f"{base}/services/oauth2/token"
 
-    def _refresh_access_token(self) -> Tuple[str, str]:
+    async def _refresh_access_token(self) -> Tuple[str, str]:
         if not (self.client_id and self.client_secret and self.refresh_token):
             raise SalesforceAuthError("Missing OAuth env vars: SF_CLIENT_ID/SF_CLIENT_SECRET/SF_REFRESH_TOKEN")
         data = {
@@ -176,10 +284,10 @@ class SalesforceClient:
             "client_secret": self.client_secret,
             "refresh_token": self.refresh_token,
         }
-        resp = requests.post(self._token_endpoint(), data=data, timeout=30)
+        resp = await _HTTP.post(self._token_endpoint(), data=data)
         if resp.status_code != 200:
             raise SalesforceAuthError(f"OAuth refresh failed: {resp.status_code} {resp.text}")
-        tok = resp.json()
+        tok = _json_loads(resp.content)
         access_token = tok.get("access_token")
         instance_url = tok.get("instance_url", self.instance_url)
         if not (access_token and instance_url):
@@ -187,143 +295,346 @@ class SalesforceClient:
         return access_token, instance_url
 
     async def connect(self) -> None:
-        def _connect_sync() -> Salesforce:
-            # Prefer OAuth refresh token
+        # Serialize connection attempts so a burst of cold tool calls issues a
+        # single OAuth refresh instead of one per caller.
+        async with self._connect_lock:
+            if self.connected:
+                return
+            # Prefer OAuth refresh token (async, no thread hop needed)
+            self._sobjects.clear()
             try:
-                access_token, inst_url = self._refresh_access_token()
-                sf = Salesforce(instance_url=inst_url, session_id=access_token)
+                access_token, inst_url = await self._refresh_access_token()
+                self._sf = Salesforce(instance_url=inst_url, session_id=access_token)
                 self._access_token = access_token
-                return sf
+                self._instance = inst_url
+                self._token_expiry = datetime.now(timezone.utc) + timedelta(minutes=TOKEN_TTL_MINUTES)
+                # Built once per login and reused verbatim on every REST call
+                self._rest_headers = {
+                    "Authorization": f"Bearer {access_token}",
+                    "Content-Type": "application/json",
+                }
             except Exception as e:
                 logger.warning("OAuth refresh failed, attempting username/password if provided: %s", e)
                 if not (self.username and self.password and self.security_token):
                     raise
-                # Fallback: username/password
-                return Salesforce(
+                # Fallback: username/password login still goes through
+                # simple_salesforce's blocking flow, so keep the thread hop.
+                self._token_expiry = None
+                self._rest_headers = None
+                self._sf = await asyncio.to_thread(
+                    Salesforce,
                     username=self.username,
                     password=self.password,
                     security_token=self.security_token,
                     domain=self.domain,
                 )
+            logger.info("Connected to Salesforce")
 
-        self._sf = await asyncio.to_thread(_connect_sync)
-        logger.info("Connected to Salesforce")
-
-    async def soql(self, query: str) -> Dict[str, Any]:
-        async def _query_sync() -> Dict[str, Any]:
-            assert self._sf is not None
-            return self._sf.query(query)  # type: ignore[attr-defined]
+    async def _call_with_reauth(self, fn, *args: Any) -> Dict[str, Any]:
+        """Run a blocking simple_salesforce call, reconnecting once if the
+        session expired underneath us."""
         try:
-            return await asyncio.to_thread(lambda: self._sf.query(query))  # type: ignore
-        except SalesforceMalformedRequest as e:  # type: ignore
-            raise
-        except Exception as e:
-            raise
+            return await asyncio.to_thread(fn, *args)
+        except SalesforceExpiredSession:  # type: ignore[misc]
+            logger.info("Salesforce session expired; reconnecting and retrying once")
+            self._sf = None
+            await self.connect()
+            return await asyncio.to_thread(fn, *args)
+
+    async def _rest_request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        payload: Optional[Any] = None,
+    ) -> httpx.Response:
+        """Issue one REST call on the pooled async client.
+
+        ``path`` is relative to the versioned data endpoint unless it starts
+        with "/" (e.g. a nextRecordsUrl). Mirrors _call_with_reauth: one
+        reconnect-and-retry when Salesforce reports the session expired.
+        """
+        content = _json_dumps_bytes(payload) if payload is not None else None
+        for attempt in (0, 1):
+            assert self._rest_headers is not None and self._instance is not None
+            url = (
+                f"{self._instance}{path}"
+                if path.startswith("/")
+                else f"{self._instance}/services/data/{SF_API_VERSION}/{path}"
+            )
+            resp = await _HTTP.request(method, url, headers=self._rest_headers, params=params, content=content)
+            if resp.status_code == 401 and attempt == 0:
+                logger.info("Salesforce session expired; reconnecting and retrying once")
+                self._sf = None
+                self._token_expiry = None
+                await self.connect()
+                continue
+            resp.raise_for_status()
+            return resp
+        raise AssertionError("unreachable")
+
+    async def soql(self, query: str, max_records: Optional[int] = None) -> Dict[str, Any]:
+        if self._rest_headers is not None:
+            # Direct async path: no thread hop, headers prebuilt at login
+            resp = await self._rest_request("GET", "query", params={"q": query})
+            page: Dict[str, Any] = _json_loads(resp.content)
+            if max_records is None:
+                return page
+            records: List[Dict[str, Any]] = page.get("records", [])
+            while len(records) < max_records and not page.get("done", True):
+                resp = await self._rest_request("GET", page["nextRecordsUrl"])
+                page = _json_loads(resp.content)
+                records.extend(page.get("records", ()))
+            del records[max_records:]
+            return {"totalSize": len(records), "done": True, "records": records}
+
+        def _query_sync(q: str) -> Dict[str, Any]:
+            assert self._sf is not None
+            if max_records is not None and hasattr(self._sf, "query_all_iter"):
+                # Stream pages lazily and stop once we have enough, so a query
+                # matching thousands of rows never decodes past max_records.
+                records = list(itertools.islice(self._sf.query_all_iter(q), max_records))  # type: ignore[attr-defined]
+                return {"totalSize": len(records), "done": True, "records": records}
+            return self._sf.query(q)  # type: ignore[attr-defined]
+        return await self._call_with_reauth(_query_sync, query)
+
+    async def soql_iter(self, query: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield records one at a time, fetching result pages on demand.
+
+        Follows nextRecordsUrl page by page so callers that stop early (or
+        process rows as they arrive) never hold the full result set in
+        memory the way soql() does.
+        """
+        page = await self._call_with_reauth(self._sf_query_page, query, None)
+        while True:
+            for record in page.get("records", ()):
+                yield record
+            next_url = page.get("nextRecordsUrl")
+            if page.get("done", True) or not next_url:
+                return
+            # Reauth already happened (if needed) on the first page; the
+            # locator in nextRecordsUrl would not survive a new session.
+            page = await asyncio.to_thread(self._sf_query_page, query, next_url)
+
+    def _sf_query_page(self, query: str, next_url: Optional[str]) -> Dict[str, Any]:
+        assert self._sf is not None
+        if next_url:
+            return self._sf.query_more(next_url, identifier_is_url=True)  # type: ignore[attr-defined]
+        return self._sf.query(query)  # type: ignore[attr-defined]
 
     async def create(self, sobject: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        def _create_sync() -> Dict[str, Any]:
-            assert self._sf is not None
-            sobj = getattr(self._sf, sobject)  # type: ignore[attr-defined]
-            return sobj.create(data)  # type: ignore
-        return await asyncio.to_thread(_create_sync)
+        if self._rest_headers is not None:
+            resp = await self._rest_request("POST", f"sobjects/{sobject}", payload=data)
+            return _json_loads(resp.content)  # type: ignore[no-any-return]
+
+        def _create_sync(sobj: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+            return self._sobject(sobj).create(payload)  # type: ignore[no-any-return]
+        return await self._call_with_reauth(_create_sync, sobject, data)
+
+    async def update(self, sobject: str, record_id: str, data: Dict[str, Any]) -> Any:
+        if self._rest_headers is not None:
+            # 204 No Content on success, like simple_salesforce's status-code return
+            resp = await self._rest_request("PATCH", f"sobjects/{sobject}/{record_id}", payload=data)
+            return resp.status_code
+
+        def _update_sync(sobj: str, rid: str, payload: Dict[str, Any]) -> Any:
+            return self._sobject(sobj).update(rid, payload)
+        return await self._call_with_reauth(_update_sync, sobject, record_id, data)
+
+    async def soql_bulk(self, soql: str) -> List[Dict[str, Any]]:
+        """Run a large read through Bulk API 2.0 and return all rows.
+
+        Salesforce chains result pages via the Sforce-Locator header (each
+        page's locator only arrives with the previous page), so pages are
+        fetched back-to-back on the pooled client rather than in parallel.
+        Requires the OAuth session; callers fall back to REST without one.
+        """
+        if not (self._access_token and self._instance):
+            raise SalesforceAuthError("Bulk queries require an OAuth session")
+        base = f"{self._instance}/services/data/{SF_API_VERSION}/jobs/query"
+        hdr = {"Authorization": f"Bearer {self._access_token}", "Content-Type": "application/json"}
+        resp = await _HTTP.post(base, headers=hdr, content=_json_dumps_bytes({"operation": "query", "query": soql}))
+        resp.raise_for_status()
+        job_id = _json_loads(resp.content)["id"]
+        delay = 0.5
+        while True:
+            info = _json_loads((await _HTTP.get(f"{base}/{job_id}", headers=hdr)).content)
+            state = info.get("state")
+            if state == "JobComplete":
+                break
+            if state in ("Failed", "Aborted"):
+                raise RuntimeError(f"Bulk query job {state}: {info.get('errorMessage')}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 5.0)
+        records: List[Dict[str, Any]] = []
+        locator: Optional[str] = None
+        while True:
+            params: Dict[str, Any] = {"maxRecords": 10000}
+            if locator:
+                params["locator"] = locator
+            page = await _HTTP.get(f"{base}/{job_id}/results", headers={**hdr, "Accept": "text/csv"}, params=params)
+            page.raise_for_status()
+            records.extend(csv.DictReader(io.StringIO(page.text)))
+            locator = page.headers.get("Sforce-Locator")
+            if not locator or locator == "null":
+                return records
+
+    async def close(self) -> None:
+        """Release the Salesforce session and the pooled HTTP connections."""
+        self._sf = None
+        self._sobjects.clear()
+        self._token_expiry = None
+        self._rest_headers = None
+        await _HTTP.aclose()
+
+    async def composite_update(self, sobject: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """PATCH up to 200 records of one sObject in a single REST call.
+
+        ``records`` entries carry ``id`` and ``fields`` as in
+        tool_bulk_update_records; returns the per-record result array.
+        """
+        payload = {
+            "allOrNone": False,
+            "records": [
+                {"attributes": {"type": sobject}, "id": r["id"], **r["fields"]}
+                for r in records
+            ],
+        }
+        if self._rest_headers is not None:
+            resp = await self._rest_request("PATCH", "composite/sobjects", payload=payload)
+            return _json_loads(resp.content)  # type: ignore[no-any-return]
 
-    async def update(self, sobject: str, record_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        def _update_sync() -> Dict[str, Any]:
+        def _composite_sync(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+            # Pre-serialized so orjson handles the payload; the session's
+            # default headers already carry application/json.
             assert self._sf is not None
-            sobj = getattr(self._sf, sobject)  # type: ignore[attr-defined]
-            return sobj.update(record_id, data)  # type: ignore
-        return await asyncio.to_thread(_update_sync)
+            return self._sf.restful("composite/sobjects", method="PATCH", data=_json_dumps_bytes(body))  # type: ignore[attr-defined]
+        return await self._call_with_reauth(_composite_sync, payload)
 
 
 # ------------------------------------------------------------
 # NLP to SOQL generation for donor criteria
 # ------------------------------------------------------------
+# SOQL skeletons assembled once at import; the builders fill in the numeric
+# holes with a single .format call instead of re-concatenating literals.
+_LAPSED_SOQL_TMPL = (
+    "SELECT Id, Name, Email, npo02__TotalOppAmount__c, npo02__LastCloseDate__c "
+    "FROM Contact "
+    "WHERE npo02__NumberOfClosedOpps__c > 0 "
+    "AND npo02__LastCloseDate__c < LAST_N_DAYS:{days} "
+    "ORDER BY npo02__TotalOppAmount__c DESC NULLS LAST "
+    "LIMIT {limit}"
+)
+_MAJOR_SOQL_TMPL = (
+    "SELECT Id, Name, Email, npo02__TotalOppAmount__c "
+    "FROM Contact "
+    "WHERE npo02__TotalOppAmount__c > {amount} "
+    "ORDER BY npo02__TotalOppAmount__c DESC "
+    "LIMIT {limit}"
+)
+_RECENT_SOQL_TMPL = (
+    "SELECT Id, Name, Email, npo02__LastCloseDate__c "
+    "FROM Contact WHERE npo02__LastCloseDate__c = LAST_N_DAYS:{days} "
+    "LIMIT {limit}"
+)
+_FIRST_TIME_SOQL_TMPL = (
+    "SELECT Id, Name, Email FROM Contact "
+    "WHERE npo02__NumberOfClosedOpps__c = 1 LIMIT {limit}"
+)
+
+
 class SOQLBuilder:
+    # The builders are pure string formatters over a small parameter space,
+    # so repeated tool calls reuse the cached SOQL instead of re-formatting.
+    #
+    # Segments lean on the NPSP opportunity rollups (npo02__TotalOppAmount__c,
+    # npo02__LastCloseDate__c, npo02__NumberOfClosedOpps__c): a single indexed
+    # WHERE on the precomputed Contact fields replaces the correlated
+    # OpportunityContactRole semi-joins, which SF executes as two-phase scans.
     @staticmethod
+    @functools.lru_cache(maxsize=256)
     def lapsed_donors(months: int = 12, limit: int = DEFAULT_LIMIT) -> str:
-        # Donors with gifts > 12 months ago but none in last 12 months
-        return (
-            "SELECT Id, Name, Email, "
-            "(SELECT SUM(Amount) total FROM Opportunities WHERE IsWon=true) LifetimeGiving, "
-            "(SELECT MAX(CloseDate) lastGiftDate FROM Opportunities WHERE IsWon=true) LastGiftDate "
-            "FROM Contact "
-            "WHERE Id IN (SELECT ContactId FROM OpportunityContactRole WHERE Opportunity.IsWon=true) "
-            f"AND Id NOT IN (SELECT ContactId FROM OpportunityContactRole WHERE Opportunity.IsWon=true AND Opportunity.CloseDate = LAST_N_DAYS:{months*30}) "
-            f"LIMIT {limit}"
-        )
+        # Donors with past gifts but none in the window
+        return _LAPSED_SOQL_TMPL.format(days=months * 30, limit=limit)
 
     @staticmethod
+    @functools.lru_cache(maxsize=256)
     def major_donors_over(amount: float, limit: int = DEFAULT_LIMIT) -> str:
         # Contacts whose lifetime giving exceeds amount
-        return (
-            "SELECT Id, Name, Email, "
-            "(SELECT SUM(Amount) total FROM Opportunities WHERE IsWon=true) LifetimeGiving "
-            "FROM Contact "
-            "WHERE Id IN (SELECT ContactId FROM OpportunityContactRole WHERE Opportunity.IsWon=true) "
-            f"AND Id IN (SELECT ContactId FROM OpportunityContactRole WHERE Opportunity.IsWon=true GROUP BY ContactId HAVING SUM(Opportunity.Amount) > {int(amount)}) "
-            f"LIMIT {limit}"
-        )
+        return _MAJOR_SOQL_TMPL.format(amount=int(amount), limit=limit)
 
     @staticmethod
+    @functools.lru_cache(maxsize=256)
     def recent_donors_last_n_months(months: int, limit: int = DEFAULT_LIMIT) -> str:
-        days = max(1, months * 30)
-        return (
-            "SELECT Id, Name, Email, "
-            "(SELECT MAX(CloseDate) lastGiftDate FROM Opportunities WHERE IsWon=true AND CloseDate = LAST_N_DAYS:"
-            f"{days}) LastGiftDate "
-            "FROM Contact WHERE Id IN (SELECT ContactId FROM OpportunityContactRole WHERE "
-            f"Opportunity.IsWon=true AND Opportunity.CloseDate = LAST_N_DAYS:{days}) "
-            f"LIMIT {limit}"
-        )
+        return _RECENT_SOQL_TMPL.format(days=max(1, months * 30), limit=limit)
 
     @staticmethod
+    @functools.lru_cache(maxsize=256)
     def first_time_donors(limit: int = DEFAULT_LIMIT) -> str:
         # Contacts with exactly one won opportunity
-        return (
-            "SELECT Id, Name, Email FROM Contact WHERE "
-            "Id IN (SELECT ContactId FROM OpportunityContactRole WHERE Opportunity.IsWon=true GROUP BY ContactId HAVING COUNT(Opportunity.Id) = 1) "
-            f"LIMIT {limit}"
-        )
+        return _FIRST_TIME_SOQL_TMPL.format(limit=limit)
 
 
-def build_soql_from_criteria(criteria: str, limit: int = DEFAULT_LIMIT) -> Tuple[str, Dict[str, Any]]:
-    """Return (soql, meta) based on simple NL parsing.
+# One DFA pass picks the donor segment; m.lastgroup names the handler,
+# replacing the cascade of substring scans the old if/elif chain paid per call.
+_SEGMENT_RE = re.compile(r"(?P<lapsed>lapsed)|(?P<major>major|over|\$)|(?P<recent>recent)|(?P<first>first)", re.ASCII)
 
-    Handles: lapsed donors, major donors over $X, recent donors last N months, first-time donors.
-    """
-    text = criteria.lower().strip()
+
+def _segment_lapsed(text: str, limit: int) -> Tuple[str, Dict[str, Any]]:
+    months = parse_timeframe_months(text, default=12)
+    return SOQLBuilder.lapsed_donors(months=months, limit=limit), {"segment": "lapsed_donors", "months": months}
+
+
+def _segment_major(text: str, limit: int) -> Tuple[str, Dict[str, Any]]:
+    amt = parse_amount(text) or 1000.0
+    # Quantize to int so float variants of the same amount share a cache slot
+    return SOQLBuilder.major_donors_over(amount=int(amt), limit=limit), {"segment": "major_donors_over", "amount": amt}
+
+
+def _segment_recent(text: str, limit: int) -> Tuple[str, Dict[str, Any]]:
+    months = parse_timeframe_months(text, default=6)
+    return SOQLBuilder.recent_donors_last_n_months(months=months, limit=limit), {"segment": "recent_donors", "months": months}
+
+
+def _segment_first(text: str, limit: int) -> Tuple[str, Dict[str, Any]]:
+    return SOQLBuilder.first_time_donors(limit=limit), {"segment": "first_time_donors"}
+
+
+_SEGMENT_HANDLERS = {
+    "lapsed": _segment_lapsed,
+    "major": _segment_major,
+    "recent": _segment_recent,
+    "first": _segment_first,
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_soql_cached(text: str, limit: int) -> Tuple[str, Dict[str, Any]]:
     meta: Dict[str, Any] = {"limit": limit}
 
-    if "lapsed" in text:
-        months = 12
-        tf = parse_timeframe(text)
-        if tf:
-            # approximate months from days delta
-            months = max(1, int((datetime.now(timezone.utc) - tf.start).days / 30))
-        meta.update({"segment": "lapsed_donors", "months": months})
-        return SOQLBuilder.lapsed_donors(months=months, limit=limit), meta
-
-    if "major" in text or "over" in text or "$" in text:
-        amt = parse_amount(text) or 1000.0
-        meta.update({"segment": "major_donors_over", "amount": amt})
-        return SOQLBuilder.major_donors_over(amount=amt, limit=limit), meta
-
-    if "recent" in text and "month" in text:
-        months = 6
-        tf = parse_timeframe(text)
-        if tf:
-            months = max(1, int((datetime.now(timezone.utc) - tf.start).days / 30))
-        meta.update({"segment": "recent_donors", "months": months})
-        return SOQLBuilder.recent_donors_last_n_months(months=months, limit=limit), meta
-
-    if "first" in text or "first-time" in text:
-        meta.update({"segment": "first_time_donors"})
-        return SOQLBuilder.first_time_donors(limit=limit), meta
+    m = _SEGMENT_RE.search(text)
+    if m:
+        soql, seg_meta = _SEGMENT_HANDLERS[m.lastgroup](text, limit)
+        meta.update(seg_meta)
+        return soql, meta
 
     # Default: recent donors 6 months
-    months = 6
-    meta.update({"segment": "recent_donors", "months": months, "defaulted": True})
-    return SOQLBuilder.recent_donors_last_n_months(months=months, limit=limit), meta
+    meta.update({"segment": "recent_donors", "months": 6, "defaulted": True})
+    return SOQLBuilder.recent_donors_last_n_months(months=6, limit=limit), meta
+
+
+def build_soql_from_criteria(criteria: str, limit: int = DEFAULT_LIMIT) -> Tuple[str, Dict[str, Any]]:
+    """Return (soql, meta) based on simple NL parsing.
+
+    Handles: lapsed donors, major donors over $X, recent donors last N months, first-time donors.
+    LLM agents tend to repeat identical criteria verbatim, so the parse is
+    memoized on whitespace/case-normalized text; meta is copied per call so
+    callers may mutate it.
+    """
+    normalized = " ".join(criteria.lower().split())
+    soql, meta = _build_soql_cached(normalized, limit)
+    return soql, dict(meta)
 
 
 # ------------------------------------------------------------
@@ -337,12 +648,12 @@ def nl_to_soql(question: str, default_limit: int = DEFAULT_LIMIT) -> Tuple[str,
     q = question.lower().strip()
 
     # How many donations have we had this month?
-    if re.search(r"how\s+many\s+(donation|gift)s?.*this\s+month", q):
+    if _HOW_MANY_RE.search(q):
         soql = "SELECT COUNT() FROM Opportunity WHERE IsWon = true AND CloseDate = THIS_MONTH"
         return soql, "Count of won opportunities in the current month"
 
     # Who are our top donors this quarter? (top N by sum)
-    m = re.search(r"top\s+(\d+)\s+donor", q)
+    m = _TOP_N_RE.search(q)
     top_n = int(m.group(1)) if m else 10
     if "top" in q and "donor" in q and ("quarter" in q or "this quarter" in q):
         # Aggregate by Contact via OpportunityContactRole
@@ -366,7 +677,7 @@ def nl_to_soql(question: str, default_limit: int = DEFAULT_LIMIT) -> Tuple[str,
         return soql, "Contacts who gave last year but not yet this year"
 
     # Recent donors N months
-    m = re.search(r"last\s*(\d+)\s*months?", q)
+    m = _LAST_N_MONTHS_RE.search(q)
     if ("donor" in q or "gift" in q) and m:
         months = max(1, int(m.group(1)))
         soql = SOQLBuilder.recent_donors_last_n_months(months=months, limit=default_limit)
@@ -379,66 +690,197 @@ def nl_to_soql(question: str, default_limit: int = DEFAULT_LIMIT) -> Tuple[str,
 # ------------------------------------------------------------
 # MCP Server and Tools
 # ------------------------------------------------------------
+# Preformatted write-tool replies: one .format per response instead of
+# re-concatenating header + fragments on every call.
+_RECORD_CREATED_TMPL = header("Record Created") + "\n- sObject: {sobject}\n- Id: {id}\n- Fields: {fields}"
+_RECORD_UPDATED_TMPL = header("Record Updated") + "\n- sObject: {sobject}\n- Id: {id}\n- Fields: {fields}"
+_TASK_CREATED_TMPL = header("Task Created") + "\n- Id: {id}\n- Subject: {subject}\n- WhoId: {who}"
+_CONTACT_CREATED_TMPL = header("Contact Created") + "\n- Id: {id}\n- Name: {name}"
+_OPP_CREATED_TMPL = header("Opportunity Created") + "\n- Id: {id}\n- Name: {name}\n- Amount: {amount}"
+_CONTACT_STAGE_TMPL = header("Contact Updated") + "\n- Id: {id}\n- Stage: {stage}"
+_VALIDATION_HDR = header("Validation Error")
+
+
+def _require(**fields: Any) -> Optional[str]:
+    """Return a Validation Error reply naming falsy fields, or None if all present."""
+    missing = [k for k, v in fields.items() if not v]
+    if not missing:
+        return None
+    return _VALIDATION_HDR + "\n- Missing fields: " + ", ".join(missing)
+
+
 class FundraisingServer:
+    __slots__ = ("server", "fastmcp", "sf", "cache", "_inflight", "_connected_fut", "_last_written")
+
     def __init__(self) -> None:
         self.server = Server("fundraising-mcp") if (MCP_AVAILABLE and not FASTMCP_AVAILABLE) else None
         self.fastmcp = FastMCP("fundraising-mcp") if FASTMCP_AVAILABLE else None
         self.sf = SalesforceClient()
         self.cache: TTLCache[str, Dict[str, Any]] = TTLCache(maxsize=128, ttl=CACHE_TTL_SECONDS)
+        # In-flight SOQL keyed like the cache, so concurrent identical reads
+        # collapse to one Salesforce call instead of racing the cache write.
+        self._inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        # Pre-resolved future handed back by ensure_connected's hot path
+        self._connected_fut: Optional["asyncio.Future[None]"] = None
+        # Small LRU of the field set last written per (sObject, Id); bulk
+        # updates consult it to skip PATCHes that would change nothing.
+        self._last_written: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        if self.fastmcp is not None:
+            self._register_tools(self.fastmcp)
 
-    async def ensure_connected(self) -> None:
-        try:
-            # _sf is set after connect(); avoid re-connecting every call
-            if getattr(self.sf, "_sf", None) is None:
-                await self.sf.connect()
-        except Exception as e:
-            raise
+    def _register_tools(self, m: Any) -> None:
+        """Register bound tool methods directly (once, at construction).
+
+        Registering self.tool_* avoids the wrapper closure the old per-start
+        registration created, so each LLM tool call skips one coroutine frame.
+        """
+        m.tool(name="run_soql")(self.tool_run_soql)
+        m.tool(name="create_record")(self.tool_create_record)
+        m.tool(name="update_record")(self.tool_update_record)
+
+    def ensure_connected(self) -> Awaitable[None]:
+        # connect() is a no-op while the cached session is still fresh, so
+        # this only pays an OAuth refresh on cold start or near token expiry.
+        # While connected, hand back one cached completed future instead of
+        # spinning up a coroutine frame for every tool call.
+        if not self.sf.connected:
+            return self.sf.connect()
+        fut = self._connected_fut
+        loop = asyncio.get_running_loop()
+        if fut is None or fut.get_loop() is not loop:
+            fut = loop.create_future()
+            fut.set_result(None)
+            self._connected_fut = fut
+        return fut
 
     # ------------------------ Helper responses ------------------------
+    @staticmethod
+    def _record_lines(r: Dict[str, Any]) -> str:
+        """Format one donor record as a pre-joined multi-line block.
+
+        Runs once per record on every read tool, so fallback lookups use
+        membership tests instead of allocating `{}` defaults.
+        """
+        name = r.get("Name") or (r["Contact"].get("Name") if "Contact" in r else None) or "Unknown"
+        email = r.get("Email")
+        total = r.get("LifetimeGiving") or r.get("total") or r.get("npo02__TotalOppAmount__c")
+        if not total and "attributes" in r:
+            total = r["attributes"].get("total")
+        last = r.get("LastGiftDate") or r.get("lastGiftDate") or r.get("npo02__LastCloseDate__c")
+        if isinstance(last, list) and last:
+            last = last[0]
+        parts = [f"- Name: {name}"]
+        if email:
+            parts.append(f"  - Email: {email}")
+        if total:
+            if not isinstance(total, (int, float)):
+                total = float(total)
+            parts.append(f"  - Lifetime Giving: {fmt_currency(total)}")
+        if last:
+            parts.append(f"  - Last Gift: {last if isinstance(last, str) else fmt_date(last)}")
+        return "\n".join(parts)
+
     def _format_records(self, title: str, records: List[Dict[str, Any]], insights: List[str], next_steps: List[str]) -> str:
-        lines = [header(title)]
-        for r in records:
-            name = r.get("Name") or r.get("Contact", {}).get("Name") or "Unknown"
-            email = r.get("Email") or ""
-            total = r.get("LifetimeGiving") or r.get("total") or r.get("attributes", {}).get("total")
-            last = r.get("LastGiftDate") or r.get("lastGiftDate")
-            if isinstance(last, list) and last:
-                last = last[0]
-            lines.append(f"- Name: {name}")
-            if email:
-                lines.append(f"  - Email: {email}")
-            if total:
-                lines.append(f"  - Lifetime Giving: {fmt_currency(float(total) if not isinstance(total, (int, float)) else total)}")
-            if last:
-                if isinstance(last, str):
-                    lines.append(f"  - Last Gift: {last}")
-                else:
-                    lines.append(f"  - Last Gift: {fmt_date(last)}")
+        # MCP tool results are delivered as a single TextContent, so true
+        # streaming isn't available; a growable StringIO at least avoids
+        # holding the line list and the joined copy at the same time on
+        # large record sets.
+        buf = io.StringIO()
+        write = buf.write
+        write(header(title))
+        # List comprehension with the formatter hoisted to a local: CPython
+        # pre-sizes the list and the loop body is all LOAD_FAST.
+        fmt_record = self._record_lines
+        rows = [fmt_record(r) for r in records]
+        if rows:
+            write("\n")
+            write("\n".join(rows))
         if insights:
-            lines.append("")
-            lines.append(header("AI Insights"))
-            lines.extend([f"- {i}" for i in insights])
+            write("\n\n")
+            write(header("AI Insights"))
+            for i in insights:
+                write(f"\n- {i}")
         if next_steps:
-            lines.append("")
-            lines.append(header("Next Steps"))
-            lines.extend([f"- {n}" for n in next_steps])
-        return "\n".join(lines)
+            write("\n\n")
+            write(header("Next Steps"))
+            for n in next_steps:
+                write(f"\n- {n}")
+        return buf.getvalue()
+
+    async def _cached_soql(self, soql: str, max_records: Optional[int] = None) -> Dict[str, Any]:
+        """Run a read-only SOQL query through the shared TTL cache.
+
+        Keyed on the SOQL text itself so identical queries issued by
+        different tools share one entry. ``max_records`` bounds how many rows
+        are fetched on a miss (never applied to COUNT() queries, which carry
+        their result in totalSize).
+        """
+        if max_records is not None and soql.lower().startswith("select count"):
+            max_records = None
+        key = soql if max_records is None else f"{soql}\x00max={max_records}"
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+
+        async def _run() -> Dict[str, Any]:
+            res = await self.sf.soql(soql, max_records=max_records)
+            self.cache[key] = res
+            return res
+
+        return await self._single_flight(key, _run)
+
+    def _note_write(self) -> None:
+        """Drop cached reads after a successful write.
+
+        The cache is small and its TTL short, so a coarse clear keeps reads
+        from serving pre-write results for up to a minute without tracking
+        which queries touch which sObjects.
+        """
+        self.cache.clear()
+
+    def _remember_written(self, sobject: str, record_id: str, fields: Dict[str, Any]) -> None:
+        lru = self._last_written
+        lru[(sobject, record_id)] = fields
+        lru.move_to_end((sobject, record_id))
+        if len(lru) > LAST_WRITTEN_MAX:
+            lru.popitem(last=False)
+
+    async def _single_flight(self, key: str, run) -> Dict[str, Any]:
+        """Coalesce concurrent identical requests onto one in-flight call."""
+        fut = self._inflight.get(key)
+        if fut is not None:
+            return await fut
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result = await run()
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved so lone failures don't warn
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
 
     # ------------------------ Tool impls ------------------------
     async def tool_query_donors(self, criteria: str, limit: int = DEFAULT_LIMIT) -> str:
         await self.ensure_connected()
         soql, meta = build_soql_from_criteria(criteria, limit=limit)
-        cache_key = json.dumps({"t": "q", "q": soql})
-        if cache_key in self.cache:
-            result = self.cache[cache_key]
-        else:
-            try:
-                result = await self.sf.soql(soql)
-            except SalesforceMalformedRequest as e:  # type: ignore
-                return (header("SOQL Error") + f"\n- Query: `{soql}`\n- Message: {e}\n- Suggestion: Check field names and ensure NPSP is installed.")
-            except Exception as e:
-                return header("Salesforce Error") + f"\n- Unable to query donors. {e}"
-            self.cache[cache_key] = result
+        try:
+            if limit > BULK_QUERY_THRESHOLD and getattr(self.sf, "_access_token", None):
+                async def _bulk() -> Dict[str, Any]:
+                    records = await self.sf.soql_bulk(soql)
+                    return {"totalSize": len(records), "records": records}
+                # Bulk jobs bypass the TTL cache but still coalesce duplicates
+                result = await self._single_flight(f"{soql}\x00bulk", _bulk)
+            else:
+                result = await self._cached_soql(soql, max_records=limit)
+        except SalesforceMalformedRequest as e:  # type: ignore
+            return (header("SOQL Error") + f"\n- Query: `{soql}`\n- Message: {e}\n- Suggestion: Check field names and ensure NPSP is installed.")
+        except Exception as e:
+            return header("Salesforce Error") + f"\n- Unable to query donors. {e}"
         records = result.get("records", [])[:limit]
         insights = [
             f"Segment: {meta.get('segment')}",
@@ -453,8 +895,11 @@ class FundraisingServer:
     async def tool_run_soql(self, query: str, limit: int = DEFAULT_LIMIT) -> str:
         await self.ensure_connected()
         q = query.strip()
+        # Enforce the cap server-side rather than slicing a full page client-side
+        if not q.lower().startswith("select count") and _LIMIT_CLAUSE_RE.search(q) is None:
+            q = f"{q} LIMIT {limit}"
         try:
-            res = await self.sf.soql(q)
+            res = await self._cached_soql(q, max_records=limit)
         except Exception as e:
             return header("Salesforce Error") + f"\n- Unable to run SOQL. {e}\n- Query: `{q}`"
         # Special-case COUNT()
@@ -462,7 +907,7 @@ class FundraisingServer:
             return header("SOQL Count Result") + f"\n- Count: {res.get('totalSize', 0)}\n- Query: `{q}`"
         # Truncate for display
         records = res.get("records", [])[:limit]
-        return header("SOQL Result") + f"\n- Records returned: {len(records)} of {res.get('totalSize', len(records))}\n- Query: `{q}`\n\n" + json.dumps(records, default=str, indent=2)
+        return header("SOQL Result") + f"\n- Records returned: {len(records)} of {res.get('totalSize', len(records))}\n- Query: `{q}`\n\n" + _json_dumps(records, indent=True)
 
     async def tool_create_record(self, sobject: str, fields: Dict[str, Any]) -> str:
         """Generic creator for any sObject.
@@ -474,10 +919,11 @@ class FundraisingServer:
         """
         await self.ensure_connected()
         if not sobject or not isinstance(fields, dict) or not fields:
-            return header("Validation Error") + "\n- Provide sobject (string) and fields (non-empty object)."
+            return _VALIDATION_HDR + "\n- Provide sobject (string) and fields (non-empty object)."
         try:
             res = await self.sf.create(sobject, fields)
-            return header("Record Created") + f"\n- sObject: {sobject}\n- Id: {res.get('id')}\n- Fields: {json.dumps(fields, default=str)}"
+            self._note_write()
+            return _RECORD_CREATED_TMPL.format(sobject=sobject, id=res.get("id"), fields=_json_dumps(fields))
         except Exception as e:
             return header("Salesforce Error") + f"\n- Unable to create {sobject}. {e}"
 
@@ -490,10 +936,12 @@ class FundraisingServer:
         """
         await self.ensure_connected()
         if not sobject or not record_id or not isinstance(fields, dict) or not fields:
-            return header("Validation Error") + "\n- Provide sobject, record_id, and fields (non-empty object)."
+            return _VALIDATION_HDR + "\n- Provide sobject, record_id, and fields (non-empty object)."
         try:
             await self.sf.update(sobject, record_id, fields)
-            return header("Record Updated") + f"\n- sObject: {sobject}\n- Id: {record_id}\n- Fields: {json.dumps(fields, default=str)}"
+            self._note_write()
+            self._remember_written(sobject, record_id, fields)
+            return _RECORD_UPDATED_TMPL.format(sobject=sobject, id=record_id, fields=_json_dumps(fields))
         except Exception as e:
             return header("Salesforce Error") + f"\n- Unable to update {sobject} {record_id}. {e}"
 
@@ -501,7 +949,7 @@ class FundraisingServer:
         await self.ensure_connected()
         soql, why = nl_to_soql(question, default_limit=limit)
         try:
-            res = await self.sf.soql(soql)
+            res = await self._cached_soql(soql, max_records=limit)
         except Exception as e:
             return header("Salesforce Error") + f"\n- Unable to answer question. {e}\n- SOQL tried: `{soql}`"
 
@@ -534,11 +982,12 @@ class FundraisingServer:
     async def tool_get_donor_profile(self, identifier: str) -> str:
         await self.ensure_connected()
         # identifier can be Contact Id or Name
-        if not identifier:
-            return header("Validation Error") + "\n- identifier is required"
+        err = _require(identifier=identifier)
+        if err:
+            return err
         # Build SOQL to fetch contact and summary of opportunities
         # Contact/Lead/Owner style prefix check; 003 is Contact prefix
-        if re.match(r"^(003|005)[A-Za-z0-9]{12,18}$", identifier):
+        if _CONTACT_ID_RE.match(identifier):
             where = f"Id = '{identifier}'"
         else:
             # Avoid complex nested quotes inside an f-string by pre-sanitizing
@@ -551,7 +1000,7 @@ class FundraisingServer:
             f"FROM Contact WHERE {where} LIMIT 1"
         )
         try:
-            res = await self.sf.soql(soql)
+            res = await self._cached_soql(soql)
         except Exception as e:
             msg = str(e)
             if "REQUEST_LIMIT_EXCEEDED" in msg or "REQUEST_LIMIT" in msg:
@@ -577,8 +1026,12 @@ class FundraisingServer:
         if not gifts:
             lines.append("- None on record")
         else:
-            for g in gifts:
-                lines.append(f"- {fmt_date(datetime.fromisoformat(g.get('CloseDate')) if g.get('CloseDate') else None)} | {fmt_currency(g.get('Amount'))} | {g.get('StageName')}")
+            # CloseDate already arrives as ISO YYYY-MM-DD (datetime fields may
+            # carry a time suffix); slicing beats a parse + strftime roundtrip.
+            lines.extend(
+                f"- {(g.get('CloseDate') or '')[:10]} | {fmt_currency(g.get('Amount'))} | {g.get('StageName')}"
+                for g in gifts
+            )
         # Insights
         insights = [
             "Consider a stewardship touch highlighting impact of their last gift.",
@@ -590,10 +1043,10 @@ class FundraisingServer:
         ]
         lines.append("")
         lines.append(header("AI Insights"))
-        lines.extend([f"- {i}" for i in insights])
+        lines.extend(f"- {i}" for i in insights)
         lines.append("")
         lines.append(header("Next Steps"))
-        lines.extend([f"- {s}" for s in steps])
+        lines.extend(f"- {s}" for s in steps)
         return "\n".join(lines)
 
     async def tool_find_prospects(self, parameters: str = "") -> str:
@@ -605,17 +1058,15 @@ class FundraisingServer:
         except Exception as e:
             return header("Salesforce Error") + f"\n- Unable to find prospects. {e}"
         records = res.get("records", [])
-        # Score based on lifetime giving (proxy)
-        scored = []
+        # The SOQL already orders by lifetime giving, so scoring is a
+        # single pass with no client-side re-sort.
         for r in records:
-            lifetime = r.get("LifetimeGiving") or 0
+            lifetime = r.get("LifetimeGiving") or r.get("npo02__TotalOppAmount__c") or 0
             try:
                 score = float(lifetime) / 1000.0
             except Exception:
                 score = 0.0
             r["ProspectScore"] = round(score, 2)
-            scored.append(r)
-        scored.sort(key=lambda x: x.get("ProspectScore", 0), reverse=True)
         insights = [
             "Upgrade candidates prioritized by lifetime giving and lapse status.",
             "Use personalized asks ~10-20% above last gift for warm leads.",
@@ -624,47 +1075,51 @@ class FundraisingServer:
             "Schedule 3 outreach tasks with tailored messaging.",
             "Add top prospects to an upgrade cadence.",
         ]
-        return self._format_records("Prospect Candidates", scored[:DEFAULT_LIMIT], insights, steps)
+        return self._format_records("Prospect Candidates", records[:DEFAULT_LIMIT], insights, steps)
 
     # --------- Write functions (basic validations + minimal implementation) ---------
     async def tool_create_task(self, task_details: Dict[str, Any]) -> str:
         await self.ensure_connected()
-        required = ["Subject", "WhoId"]
-        missing = [k for k in required if not task_details.get(k)]
-        if missing:
-            return header("Validation Error") + f"\n- Missing fields: {', '.join(missing)}"
+        err = _require(Subject=task_details.get("Subject"), WhoId=task_details.get("WhoId"))
+        if err:
+            return err
         try:
             res = await self.sf.create("Task", task_details)
-            return header("Task Created") + f"\n- Id: {res.get('id')}\n- Subject: {task_details.get('Subject')}\n- WhoId: {task_details.get('WhoId')}"
+            self._note_write()
+            return _TASK_CREATED_TMPL.format(id=res.get("id"), subject=task_details.get("Subject"), who=task_details.get("WhoId"))
         except Exception as e:
             return header("Salesforce Error") + f"\n- Unable to create task. {e}"
 
     async def tool_create_contact(self, contact_info: Dict[str, Any]) -> str:
         await self.ensure_connected()
-        if not contact_info.get("LastName"):
-            return header("Validation Error") + "\n- LastName is required"
+        err = _require(LastName=contact_info.get("LastName"))
+        if err:
+            return err
         try:
             res = await self.sf.create("Contact", contact_info)
-            return header("Contact Created") + f"\n- Id: {res.get('id')}\n- Name: {contact_info.get('FirstName','')} {contact_info.get('LastName','')}".strip()
+            self._note_write()
+            name = f"{contact_info.get('FirstName', '')} {contact_info.get('LastName', '')}".strip()
+            return _CONTACT_CREATED_TMPL.format(id=res.get("id"), name=name)
         except Exception as e:
             return header("Salesforce Error") + f"\n- Unable to create contact. {e}"
 
     async def tool_create_opportunity(self, opportunity_details: Dict[str, Any]) -> str:
         await self.ensure_connected()
-        required = ["Name", "StageName", "CloseDate", "Amount"]
-        missing = [k for k in required if not opportunity_details.get(k)]
-        if missing:
-            return header("Validation Error") + f"\n- Missing fields: {', '.join(missing)}"
+        err = _require(**{k: opportunity_details.get(k) for k in ("Name", "StageName", "CloseDate", "Amount")})
+        if err:
+            return err
         try:
             res = await self.sf.create("Opportunity", opportunity_details)
-            return header("Opportunity Created") + f"\n- Id: {res.get('id')}\n- Name: {opportunity_details.get('Name')}\n- Amount: {fmt_currency(opportunity_details.get('Amount'))}"
+            self._note_write()
+            return _OPP_CREATED_TMPL.format(id=res.get("id"), name=opportunity_details.get("Name"), amount=fmt_currency(opportunity_details.get("Amount")))
         except Exception as e:
             return header("Salesforce Error") + f"\n- Unable to create opportunity. {e}"
 
     async def tool_log_interaction(self, contact_id: str, interaction_details: Dict[str, Any]) -> str:
         await self.ensure_connected()
-        if not contact_id:
-            return header("Validation Error") + "\n- contact_id is required"
+        err = _require(contact_id=contact_id)
+        if err:
+            return err
         data = {"Subject": interaction_details.get("Subject", "Donor Outreach"), "WhoId": contact_id}
         if interaction_details.get("Description"):
             data["Description"] = interaction_details["Description"]
@@ -672,67 +1127,95 @@ class FundraisingServer:
 
     async def tool_update_contact_stage(self, contact_id: str, stage: str) -> str:
         await self.ensure_connected()
-        if not contact_id or not stage:
-            return header("Validation Error") + "\n- contact_id and stage are required"
+        err = _require(contact_id=contact_id, stage=stage)
+        if err:
+            return err
         try:
             await self.sf.update("Contact", contact_id, {"LifecycleStage__c": stage})
-            return header("Contact Updated") + f"\n- Id: {contact_id}\n- Stage: {stage}"
+            self._note_write()
+            self._remember_written("Contact", contact_id, {"LifecycleStage__c": stage})
+            return _CONTACT_STAGE_TMPL.format(id=contact_id, stage=stage)
         except Exception as e:
             return header("Salesforce Error") + f"\n- Unable to update contact. {e}"
 
     async def tool_bulk_update_records(self, records_data: List[Dict[str, Any]]) -> str:
         await self.ensure_connected()
-        if not records_data:
-            return header("Validation Error") + "\n- records_data is empty"
-        # For MVP, process sequentially (safe) — can be optimized via Bulk API
-        updated = 0
+        err = _require(records_data=records_data)
+        if err:
+            return err
+        # Batch per sObject through the composite endpoint (200 records per
+        # HTTP call); chunks still run concurrently under a small semaphore.
         errors: List[str] = []
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        skipped = 0
         for r in records_data:
-            sobj = r.get("sobject")
-            rid = r.get("id")
-            fields = r.get("fields", {})
-            if not sobj or not rid or not fields:
+            if not r.get("sobject") or not r.get("id") or not r.get("fields"):
                 errors.append(f"Missing data for record: {r}")
                 continue
+            # Cheap dict compare against the last write we made to this
+            # record saves the full PATCH round-trip when nothing changed.
+            if self._last_written.get((r["sobject"], r["id"])) == r["fields"]:
+                skipped += 1
+                continue
+            groups.setdefault(r["sobject"], []).append(r)
+        valid = sum(len(g) for g in groups.values())
+        sem = asyncio.Semaphore(4)
+
+        async def _chunk(sobj: str, chunk: List[Dict[str, Any]]) -> List[str]:
             try:
-                await self.sf.update(sobj, rid, fields)
-                updated += 1
+                async with sem:
+                    results = await self.sf.composite_update(sobj, chunk)
             except Exception as e:
-                errors.append(f"{sobj}:{rid} -> {e}")
-        lines = [header("Bulk Update Summary"), f"- Updated: {updated}"]
+                return [f"{sobj}:{r['id']} -> {e}" for r in chunk]
+            failed = []
+            for r, res in zip(chunk, results):
+                if res.get("success"):
+                    self._remember_written(sobj, r["id"], r["fields"])
+                else:
+                    msg = "; ".join(err.get("message", "") for err in res.get("errors", [])) or "update failed"
+                    failed.append(f"{sobj}:{r['id']} -> {msg}")
+            return failed
+
+        chunk_errors = await asyncio.gather(
+            *(
+                _chunk(sobj, group[i:i + 200])
+                for sobj, group in groups.items()
+                for i in range(0, len(group), 200)
+            )
+        )
+        update_errors = [e for ce in chunk_errors for e in ce]
+        updated = valid - len(update_errors)
+        if updated:
+            self._note_write()
+        errors.extend(update_errors)
+        # Same single-buffer assembly as _format_records
+        buf = io.StringIO()
+        w = buf.write
+        w(header("Bulk Update Summary"))
+        w(f"\n- Updated: {updated}")
+        if skipped:
+            w(f"\n- Unchanged (skipped): {skipped}")
         if errors:
-            lines.append("- Errors:")
-            lines.extend([f"  - {e}" for e in errors])
-        return "\n".join(lines)
+            w("\n- Errors:")
+            for e in errors:
+                w(f"\n  - {e}")
+        return buf.getvalue()
 
     # ------------------------ Server lifecycle ------------------------
     async def start(self) -> None:
+        # Size the shared executor up front so concurrent to_thread SF calls
+        # don't queue behind asyncio's small default pool.
+        asyncio.get_running_loop().set_default_executor(
+            concurrent.futures.ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE, thread_name_prefix="sf-io")
+        )
         if not MCP_AVAILABLE or stdio_server is None:
             logger.warning("MCP library not available; cannot start stdio server. Ensure 'mcp' is installed.")
             return
 
-        # Preferred: FastMCP path
+        # Preferred: FastMCP path (tools were registered in __init__)
         if self.fastmcp is not None:
-            m = self.fastmcp
-
-            # Single general-purpose tool: let the LLM generate SOQL
-            @m.tool()
-            async def run_soql(query: str, limit: int = DEFAULT_LIMIT) -> str:  # type: ignore
-                return await self.tool_run_soql(query, limit)
-
-            # Generic creator for any sObject
-            @m.tool()
-            async def create_record(sobject: str, fields: Dict[str, Any]) -> str:  # type: ignore
-                return await self.tool_create_record(sobject, fields)
-
-            # Generic updater for any sObject
-            @m.tool()
-            async def update_record(sobject: str, record_id: str, fields: Dict[str, Any]) -> str:  # type: ignore
-                return await self.tool_update_record(sobject, record_id, fields)
-
             # Do not connect to Salesforce here; connect lazily on first tool call
-
-            await m.run_stdio_async()
+            await self.fastmcp.run_stdio_async()
             return
 
         # Fallback: legacy Server API path (only if it has 'tool')
@@ -740,21 +1223,7 @@ class FundraisingServer:
             logger.error("MCP Server API without FastMCP and no 'tool' decorator available. Please upgrade 'mcp'.")
             return
 
-        # Single general-purpose tool: let the LLM generate SOQL
-        @self.server.tool()  # type: ignore
-        async def run_soql(query: str, limit: int = DEFAULT_LIMIT) -> str:  # type: ignore
-            return await self.tool_run_soql(query, limit)
-
-        # Generic creator for any sObject
-        @self.server.tool()  # type: ignore
-        async def create_record(sobject: str, fields: Dict[str, Any]) -> str:  # type: ignore
-            return await self.tool_create_record(sobject, fields)
-
-        # Generic updater for any sObject
-        @self.server.tool()  # type: ignore
-        async def update_record(sobject: str, record_id: str, fields: Dict[str, Any]) -> str:  # type: ignore
-            return await self.tool_update_record(sobject, record_id, fields)
-
+        self._register_tools(self.server)
         await self.sf.connect()
         async with stdio_server() as (read, write):  # type: ignore
             await self.server.run(read, write)  # type: ignore
@@ -762,7 +1231,10 @@ class FundraisingServer:
 
 async def main() -> None:
     srv = FundraisingServer()
-    await srv.start()
+    try:
+        await srv.start()
+    finally:
+        await srv.sf.close()
 
 
 if __name__ == "__main__":